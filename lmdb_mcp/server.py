@@ -1,14 +1,399 @@
+import atexit
 import json
+import logging
+import math
 import os
-from typing import Any, Optional
+import re
+import threading
+from collections import Counter, OrderedDict, deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from itertools import count as _counter, islice, takewhile
+from typing import Any, Callable, Hashable, Iterable, Iterator, Optional
 
 import lmdb
+import msgspec
+import orjson
 from fastmcp import FastMCP
 
+logger = logging.getLogger(__name__)
+
+_MAX_ENVS = 32
+_envs: dict[str, lmdb.Environment] = {}
+_envs_lock = threading.RLock()
+_env_users: Counter[str] = Counter()
+_COUNT_CACHE_SIZE = 4096
+_count_cache: OrderedDict[tuple, int] = OrderedDict()
+_count_cache_lock = threading.Lock()
+_backups = ThreadPoolExecutor(max_workers=1, thread_name_prefix="lmdb-backup")
+_backup_jobs: dict[str, Future] = {}
+_JSON_SCALAR = (
+    rb'"(?:[^"\\]|\\.)*"|true|false|null|NaN|-?Infinity'
+    rb"|-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?"
+)
+_SCALAR_AFTER_KEY = re.compile(rb"\s*:\s*(" + _JSON_SCALAR + rb")")
+_decode = msgspec.json.decode
+_FINITE_TYPES = frozenset({str, int, bool, type(None)})
+
 
 def _open_env(db_path: str, readonly: bool = True) -> lmdb.Environment:
     """Open an LMDB environment."""
-    return lmdb.open(db_path, readonly=readonly, max_dbs=1, map_size=10485760)
+    return lmdb.open(
+        db_path,
+        readonly=readonly,
+        max_dbs=1,
+        map_size=10485760,
+        readahead=False,
+    )
+
+
+def _encode_key(key: str) -> bytes:
+    """Encode a row identifier for use as an LMDB key."""
+    return key.encode()
+
+
+def _loads(raw: Any) -> Any:
+    """Parse stored JSON bytes.
+
+    ``msgspec`` keeps integers of any size exact; rows it rejects, such as
+    ``NaN`` or ``Infinity`` literals and invalid JSON, go through ``json``.
+    """
+    try:
+        return _decode(raw)
+    except msgspec.DecodeError:
+        return json.loads(bytes(raw))
+
+
+def _has_non_finite(obj: Any) -> bool:
+    """Return whether ``obj`` holds a NaN or infinite float, keys included."""
+    if isinstance(obj, float):
+        return not math.isfinite(obj)
+    if isinstance(obj, dict):
+        return _has_non_finite(list(obj)) or _has_non_finite(list(obj.values()))
+    if isinstance(obj, (list, tuple)):
+        if _FINITE_TYPES.issuperset(map(type, obj)):
+            return False
+        return any(map(_has_non_finite, obj))
+    return False
+
+
+def _dumps(obj: Any) -> bytes:
+    """Serialize a value to JSON bytes for storage.
+
+    ``orjson`` rejects integers wider than 64 bits and writes non-finite
+    floats as ``null``; such values are encoded by ``json`` instead.
+    """
+    try:
+        encoded = orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    except orjson.JSONEncodeError:
+        return json.dumps(obj, separators=(",", ":")).encode()
+    # Walk the value only when orjson wrote a null it might have invented.
+    if b"null" in encoded and _has_non_finite(obj):
+        return json.dumps(obj, separators=(",", ":")).encode()
+    return encoded
+
+
+@lru_cache(maxsize=64)
+def _field_decoder(field: str) -> msgspec.json.Decoder:
+    """Return a decoder that extracts only ``field`` from a JSON object."""
+    struct = msgspec.defstruct(
+        "_Field",
+        [("value", Any, msgspec.UNSET)],
+        rename={"value": field},
+    )
+    return msgspec.json.Decoder(struct)
+
+
+@lru_cache(maxsize=128)
+def _fields_decoder(fields: tuple[str, ...]) -> msgspec.json.Decoder:
+    """Return a decoder that extracts only ``fields`` from a JSON object, in order."""
+    names = [f"f{i}" for i in range(len(fields))]
+    struct = msgspec.defstruct(
+        "_Fields",
+        [(name, Any, msgspec.UNSET) for name in names],
+        rename=dict(zip(names, fields)),
+    )
+    return msgspec.json.Decoder(struct)
+
+
+def _field_value(raw: Any, field: str, default: Any = None) -> Any:
+    """Return ``field`` of the stored JSON object ``raw``, or ``default``.
+
+    Other keys are skipped rather than materialized. Rows the typed decoder
+    rejects go through a full parse, so invalid JSON and non-object rows
+    fail exactly as ``_loads(raw).get(field, default)`` would.
+    """
+    try:
+        found = _field_decoder(field).decode(raw).value
+    except msgspec.DecodeError:
+        return _loads(raw).get(field, default)
+    return default if found is msgspec.UNSET else found
+
+
+def _is_scalar(value: Any) -> bool:
+    """Return whether ``value`` serializes to a JSON scalar."""
+    return value is None or isinstance(value, (str, int, float))
+
+
+def _patch_field(raw: bytes, field: str, current: Any, value: Any) -> Optional[bytes]:
+    """Splice a scalar ``value`` over the scalar ``current`` stored at ``field``.
+
+    The caller has already read ``current`` from the top level of ``raw``.
+    Returns None unless the encoded field name occurs exactly once and is
+    followed by ``current``, in which case the rest of the row is kept
+    byte for byte instead of being parsed and reserialized. Rows with any
+    backslash are never patched: an escaped spelling of the top-level key
+    would leave the single literal occurrence inside a nested object.
+    """
+    forms = _json_forms(field)
+    if len(forms) != 1 or b"\\" in raw or raw.count(forms[0]) != 1:
+        return None
+    match = _SCALAR_AFTER_KEY.match(raw, raw.index(forms[0]) + len(forms[0]))
+    if match is None or _loads(match.group(1)) != current:
+        return None
+    return raw[: match.start(1)] + _dumps(value) + raw[match.end(1) :]
+
+
+@lru_cache(maxsize=256)
+def _json_forms(text: str) -> tuple[bytes, ...]:
+    """Return the encodings ``text`` takes in JSON with and without ASCII escaping."""
+    forms = [json.dumps(text).encode(), _dumps(text)]
+    return tuple(dict.fromkeys(forms))
+
+
+def _value_token(value: Any) -> Hashable:
+    """Return a hashable stand-in for ``value`` that also records its types.
+
+    Values with equal tokens compare the same against every stored row, so
+    ``None`` and NaN, or dict keys ``1`` and ``"1"``, get distinct tokens.
+    Raises TypeError for unhashable leaves such as sets.
+    """
+    if isinstance(value, dict):
+        items = frozenset((_value_token(k), _value_token(v)) for k, v in value.items())
+        return dict, items
+    if isinstance(value, (list, tuple)):
+        return type(value), tuple(map(_value_token, value))
+    if isinstance(value, float):
+        return float, repr(value)
+    return type(value), hash(value), value
+
+
+def _prefix_end(prefix_b: bytes) -> Optional[bytes]:
+    """Return the smallest key above every key starting with ``prefix_b``.
+
+    Returns None when no such bound exists (empty or all-0xff prefixes).
+    """
+    stripped = prefix_b.rstrip(b"\xff")
+    if not stripped:
+        return None
+    return stripped[:-1] + bytes([stripped[-1] + 1])
+
+
+def _ilen(items: Iterable[Any]) -> int:
+    """Count ``items`` without running Python bytecode per item."""
+    counter = _counter()
+    deque(zip(items, counter), maxlen=0)
+    return next(counter)
+
+
+def _matching_rows(
+    rows: Iterable[tuple[bytes, bytes]],
+    field: str,
+    value: Any,
+    end: Optional[bytes] = None,
+) -> Iterator[tuple[bytes, bytes]]:
+    """Yield the ``(key, raw)`` rows whose top-level JSON ``field`` equals ``value``.
+
+    ``rows`` come from a cursor in key order; the scan stops at the first
+    key that is not below ``end``. This is the one per-row loop shared by
+    search, count and next_pending.
+    """
+    for key, raw in rows:
+        if end is not None and key >= end:
+            break
+        if _field_value(raw, field) == value:
+            yield key, raw
+
+
+def _count_rows(
+    env: lmdb.Environment,
+    txn: lmdb.Transaction,
+    prefix_b: bytes,
+    column: Optional[str],
+    value: Any,
+) -> int:
+    """Count rows under ``prefix_b`` whose ``column`` equals ``value`` in ``txn``."""
+    if column is None and not prefix_b:
+        return txn.stat(env.open_db())["entries"]
+    cursor = txn.cursor()
+    if not cursor.set_range(prefix_b):
+        return 0
+    end = _prefix_end(prefix_b)
+    if column is None:
+        keys = cursor.iternext(values=False)
+        if end is not None:
+            keys = takewhile(end.__gt__, keys)
+        return _ilen(keys)
+    return _ilen(_matching_rows(cursor.iternext(), column, value, end))
+
+
+def _paginate(
+    items: Iterable[Any], page: int, limit: int
+) -> tuple[list[Any], Optional[int]]:
+    """Slice one page out of ``items`` like ``list(items)[offset:offset + limit]``.
+
+    Pages from 1 onward are streamed, consuming only the items up to the end
+    of the page plus one lookahead. Zero and negative pages index from the
+    end as list slicing does, which needs every item.
+    """
+    offset = (page - 1) * limit
+    if offset < 0:
+        everything = list(items)
+        page_items = everything[offset : offset + limit]
+        has_more = offset + limit < len(everything)
+    else:
+        it = iter(items)
+        page_items = list(islice(it, offset, offset + limit))
+        has_more = next(it, None) is not None
+    return page_items, page + 1 if has_more else None
+
+
+def _env(db_path: str, readonly: bool = True) -> lmdb.Environment:
+    """Return the cached LMDB environment for ``db_path``.
+
+    LMDB allows a single open handle per environment and process, so the
+    cache is keyed by path only. A read-only handle is reopened for writing
+    the first time a write tool needs it, unless ``_acquire_env`` holds it:
+    closing it would pull it from under the holder, so that raises
+    ``lmdb.ReadonlyError`` instead. Past ``_MAX_ENVS`` handles, the least
+    recently used ones not held are closed.
+    """
+    with _envs_lock:
+        env = _envs.pop(db_path, None)
+        if env is not None and not readonly and env.flags()["readonly"]:
+            if _env_users[db_path]:
+                _envs[db_path] = env
+                raise lmdb.ReadonlyError(f"{db_path}: read-only handle in use by a backup")
+            env.close()
+            env = None
+        if env is None:
+            env = _open_env(db_path, readonly=readonly)
+            idle = [path for path in _envs if not _env_users[path]]
+            for path in idle[: max(0, len(_envs) + 1 - _MAX_ENVS)]:
+                _close_env(path)
+        _envs[db_path] = env
+        return env
+
+
+def _acquire_env(db_path: str, readonly: bool = True) -> lmdb.Environment:
+    """Return the environment for ``db_path``, kept open until released."""
+    with _envs_lock:
+        env = _env(db_path, readonly=readonly)
+        _env_users[db_path] += 1
+        return env
+
+
+def _release_env(db_path: str) -> None:
+    """Allow the environment taken by ``_acquire_env`` to be evicted again."""
+    with _envs_lock:
+        _env_users[db_path] -= 1
+        if not _env_users[db_path]:
+            del _env_users[db_path]
+
+
+def _close_env(db_path: str) -> None:
+    """Close and forget the cached environment for ``db_path``."""
+    with _envs_lock:
+        env = _envs.pop(db_path, None)
+        if env is not None:
+            env.close()
+    # Transaction ids restart if the environment is recreated.
+    with _count_cache_lock:
+        _count_cache.clear()
+
+
+@atexit.register
+def _close_all_envs() -> None:
+    """Close every cached environment."""
+    with _envs_lock:
+        for db_path in list(_envs):
+            _close_env(db_path)
+
+
+def _set_field(raw: bytes, field: str, value: Any, current: Any) -> bytes:
+    """Return ``raw`` with its top-level ``field`` set to ``value``.
+
+    ``current`` is the stored value of the field, or ``msgspec.UNSET`` if
+    the row lacks it.
+    """
+    if _is_scalar(current) and _is_scalar(value):
+        patched = _patch_field(raw, field, current, value)
+        if patched is not None:
+            return patched
+    data = _loads(raw)
+    data[field] = value
+    return _dumps(data)
+
+
+def _set_fields(raw: bytes, updates: dict) -> bytes:
+    """Return ``raw`` with its top-level fields updated from ``updates``.
+
+    When every update replaces a stored scalar with a scalar, the values are
+    spliced in one after another; otherwise the row is parsed, updated and
+    reserialized.
+    """
+    try:
+        found = _fields_decoder(tuple(updates)).decode(raw)
+    except msgspec.DecodeError:
+        found = None
+    if found is not None:
+        patched: Optional[bytes] = raw
+        current = msgspec.structs.astuple(found)
+        for (field, value), old in zip(updates.items(), current):
+            if not (_is_scalar(old) and _is_scalar(value)):
+                break
+            patched = _patch_field(patched, field, old, value)
+            if patched is None:
+                break
+        else:
+            return patched
+    data = _loads(raw)
+    data.update(updates)
+    return _dumps(data)
+
+
+def _rewrite_row(
+    env: lmdb.Environment,
+    key_b: bytes,
+    rewrite: Callable[[bytes], tuple[Optional[bytes], dict]],
+) -> Optional[dict]:
+    """Replace a row with ``rewrite(raw)`` while holding the writer lock briefly.
+
+    ``rewrite`` returns the new row (or None to leave it untouched) and the
+    tool result. It runs between transactions, and the new row is only
+    stored if the old one is unchanged once the write transaction starts;
+    otherwise the rewrite is retried on the current contents. Returns None
+    if the key does not exist.
+    """
+    while True:
+        with env.begin() as txn:
+            raw = txn.get(key_b)
+        if raw is None:
+            return None
+        new_raw, result = rewrite(raw)
+        if new_raw is None:
+            return result
+        with env.begin(write=True, buffers=True) as txn:
+            if txn.get(key_b) == raw:
+                txn.put(key_b, new_raw)
+                return result
+
+
+def _log_backup_failure(job: Future, backup_path: str) -> None:
+    """Log the error of a failed background backup."""
+    error = job.exception()
+    if error is not None:
+        logger.error("Backup to %s failed", backup_path, exc_info=error)
 
 
 server = FastMCP(
@@ -23,6 +408,7 @@ def search(
     field: str,
     value: Any,
     page: int = 1,
+    raw_json: bool = False,
 ) -> dict:
     """Search entries where a JSON field matches a value.
 
@@ -31,41 +417,42 @@ def search(
         field: JSON key to match.
         value: Desired value for the key.
         page: 1-indexed page number (10 results per page).
+        raw_json: Return each value as its stored JSON text instead of
+            parsing it into an object.
 
     Returns:
         Mapping with "results" and optional "next_page".
     """
-    env = _open_env(db_path)
-    matched: list[dict[str, Any]] = []
+    env = _env(db_path)
     with env.begin() as txn:
-        for key, raw in txn.cursor():
-            data = json.loads(raw)
-            if data.get(field) == value:
-                matched.append({"key": key.decode(), "value": data})
-    limit = 10
-    offset = (page - 1) * limit
-    page_results = matched[offset : offset + limit]
-    next_page = page + 1 if offset + limit < len(matched) else None
+        matched = _matching_rows(txn.cursor().iternext(), field, value)
+        rows, next_page = _paginate(matched, page, 10)
+    render = bytes.decode if raw_json else _loads
+    page_results = [{"key": key.decode(), "value": render(raw)} for key, raw in rows]
     return {"results": page_results, "next_page": next_page}
 
 
 @server.tool()
-def get_row(db_path: str, key: str) -> dict:
+def get_row(db_path: str, key: str, raw_json: bool = False) -> dict:
     """Retrieve the JSON value for an exact key.
 
     Args:
         db_path: Path to the LMDB environment.
         key: Row identifier to fetch.
+        raw_json: Return the value as its stored JSON text instead of
+            parsing it into an object.
 
     Returns:
         Mapping with "key" and "value" (or None if missing).
     """
-    env = _open_env(db_path)
-    with env.begin() as txn:
-        raw = txn.get(key.encode())
-    if raw is None:
-        return {"key": key, "value": None}
-    return {"key": key, "value": json.loads(raw)}
+    env = _env(db_path)
+    with env.begin(buffers=True) as txn:
+        raw = txn.get(_encode_key(key))
+        if raw is None:
+            return {"key": key, "value": None}
+        if raw_json:
+            return {"key": key, "value": str(raw, "utf-8")}
+        return {"key": key, "value": _loads(raw)}
 
 
 @server.tool()
@@ -79,44 +466,53 @@ def list_keys(db_path: str, page: int = 1) -> dict:
     Returns:
         Mapping with "keys" and optional "next_page".
     """
-    env = _open_env(db_path)
-    with env.begin() as txn:
-        keys = [k.decode() for k, _ in txn.cursor()]
-    limit = 200
-    offset = (page - 1) * limit
-    page_keys = keys[offset : offset + limit]
-    next_page = page + 1 if offset + limit < len(keys) else None
-    return {"keys": page_keys, "next_page": next_page}
+    env = _env(db_path)
+    with env.begin(buffers=True) as txn:
+        keys = txn.cursor().iternext(values=False)
+        page_keys, next_page = _paginate(keys, page, 200)
+        return {
+            "keys": [bytes(k).decode() for k in page_keys],
+            "next_page": next_page,
+        }
 
 
 @server.tool()
 def count(
     db_path: str,
     prefix: str,
-    column: str,
-    value: Any,
+    column: Optional[str] = None,
+    value: Any = None,
 ) -> dict:
-    """Count records with a key prefix and JSON column match.
+    """Count records with a key prefix and optional JSON column match.
 
     Args:
         db_path: Path to the LMDB environment.
         prefix: Key prefix to scan.
-        column: JSON key to inspect.
+        column: JSON key to inspect. When omitted, every key under the
+            prefix is counted without reading values.
         value: Desired value for the column.
 
     Returns:
         Mapping with "count".
     """
-    env = _open_env(db_path)
-    total = 0
+    prefix_b = _encode_key(prefix)
+    env = _env(db_path)
     with env.begin() as txn:
-        for key, raw in txn.cursor():
-            key_str = key.decode()
-            if not key_str.startswith(prefix):
-                continue
-            data = json.loads(raw)
-            if data.get(column) == value:
-                total += 1
+        try:
+            cache_key = (db_path, txn.id(), prefix_b, column, _value_token(value))
+        except TypeError:
+            cache_key = None
+        with _count_cache_lock:
+            total = _count_cache.get(cache_key)
+            if total is not None:
+                _count_cache.move_to_end(cache_key)
+                return {"count": total}
+        total = _count_rows(env, txn, prefix_b, column, value)
+    if cache_key is not None:
+        with _count_cache_lock:
+            _count_cache[cache_key] = total
+            if len(_count_cache) > _COUNT_CACHE_SIZE:
+                _count_cache.popitem(last=False)
     return {"count": total}
 
 
@@ -132,12 +528,12 @@ def create_record(db_path: str, key: str, value: dict) -> dict:
     Returns:
         Mapping indicating whether the record was created.
     """
-    env = _open_env(db_path, readonly=False)
+    key_b = _encode_key(key)
+    value_b = _dumps(value)
+    env = _env(db_path, readonly=False)
     with env.begin(write=True) as txn:
-        existing = txn.get(key.encode())
-        if existing is not None:
+        if not txn.put(key_b, value_b, overwrite=False):
             return {"created": False, "error": "key exists"}
-        txn.put(key.encode(), json.dumps(value).encode())
     return {"created": True}
 
 
@@ -159,15 +555,16 @@ def set_value(
     Returns:
         Mapping indicating whether the row was updated.
     """
-    env = _open_env(db_path, readonly=False)
-    with env.begin(write=True) as txn:
-        raw = txn.get(key.encode())
-        if raw is None:
-            return {"updated": False, "error": "key not found"}
-        data = json.loads(raw)
-        data[column] = value
-        txn.put(key.encode(), json.dumps(data).encode())
-    return {"updated": True}
+
+    def rewrite(raw: bytes) -> tuple[Optional[bytes], dict]:
+        current = _field_value(raw, column, msgspec.UNSET)
+        return _set_field(raw, column, value, current), {"updated": True}
+
+    env = _env(db_path, readonly=False)
+    result = _rewrite_row(env, _encode_key(key), rewrite)
+    if result is None:
+        return {"updated": False, "error": "key not found"}
+    return result
 
 
 @server.tool()
@@ -182,15 +579,15 @@ def set_columns(db_path: str, key: str, updates: dict) -> dict:
     Returns:
         Mapping indicating whether the row was updated.
     """
-    env = _open_env(db_path, readonly=False)
-    with env.begin(write=True) as txn:
-        raw = txn.get(key.encode())
-        if raw is None:
-            return {"updated": False, "error": "key not found"}
-        data = json.loads(raw)
-        data.update(updates)
-        txn.put(key.encode(), json.dumps(data).encode())
-    return {"updated": True}
+
+    def rewrite(raw: bytes) -> tuple[Optional[bytes], dict]:
+        return _set_fields(raw, updates), {"updated": True}
+
+    env = _env(db_path, readonly=False)
+    result = _rewrite_row(env, _encode_key(key), rewrite)
+    if result is None:
+        return {"updated": False, "error": "key not found"}
+    return result
 
 
 @server.tool()
@@ -204,9 +601,9 @@ def delete_record(db_path: str, key: str) -> dict:
     Returns:
         Mapping indicating whether the record was deleted.
     """
-    env = _open_env(db_path, readonly=False)
+    env = _env(db_path, readonly=False)
     with env.begin(write=True) as txn:
-        deleted = txn.delete(key.encode())
+        deleted = txn.delete(_encode_key(key))
     return {"deleted": deleted}
 
 
@@ -221,14 +618,13 @@ def bulk_insert(db_path: str, records: dict[str, dict]) -> dict:
     Returns:
         Mapping with count of inserted records.
     """
-    env = _open_env(db_path, readonly=False)
-    inserted = 0
+    items = sorted((_encode_key(k), _dumps(v)) for k, v in records.items())
+    env = _env(db_path, readonly=False)
     with env.begin(write=True) as txn:
-        for key, value in records.items():
-            if txn.get(key.encode()) is not None:
-                continue
-            txn.put(key.encode(), json.dumps(value).encode())
-            inserted += 1
+        cursor = txn.cursor()
+        # Sorted keys past the current last key can use LMDB's append path.
+        append = bool(items) and (not cursor.last() or cursor.key() < items[0][0])
+        _, inserted = cursor.putmulti(items, overwrite=False, append=append)
     return {"inserted": inserted}
 
 
@@ -250,18 +646,22 @@ def increment_field(
     Returns:
         Mapping indicating whether the row was updated and the new value.
     """
-    env = _open_env(db_path, readonly=False)
-    with env.begin(write=True) as txn:
-        raw = txn.get(key.encode())
-        if raw is None:
-            return {"updated": False, "error": "key not found"}
-        data = json.loads(raw)
-        current = data.get(field, 0)
-        if not isinstance(current, (int, float)):
-            return {"updated": False, "error": "field not numeric"}
-        data[field] = current + amount
-        txn.put(key.encode(), json.dumps(data).encode())
-    return {"updated": True, "value": current + amount}
+
+    def rewrite(raw: bytes) -> tuple[Optional[bytes], dict]:
+        current = _field_value(raw, field, msgspec.UNSET)
+        if current is msgspec.UNSET:
+            total = amount
+        elif isinstance(current, (int, float)):
+            total = current + amount
+        else:
+            return None, {"updated": False, "error": "field not numeric"}
+        return _set_field(raw, field, total, current), {"updated": True, "value": total}
+
+    env = _env(db_path, readonly=False)
+    result = _rewrite_row(env, _encode_key(key), rewrite)
+    if result is None:
+        return {"updated": False, "error": "key not found"}
+    return result
 
 
 @server.tool()
@@ -282,41 +682,88 @@ def scan_range(
     Returns:
         Mapping with "results" list of keys or key/value mappings.
     """
-    env = _open_env(db_path)
-    results = []
-    with env.begin() as txn:
+    start_b = _encode_key(start_key)
+    end_b = _encode_key(end_key)
+    if start_b > end_b:
+        return {"results": []}
+    env = _env(db_path)
+    results: list[Any] = []
+    # Key-only scans compare keys as bytes, so they skip buffer mode.
+    with env.begin(buffers=include_values) as txn:
         cursor = txn.cursor()
-        found = cursor.set_range(start_key.encode())
-        while found:
-            key = cursor.key().decode()
-            if key > end_key:
+        if not cursor.set_range(start_b):
+            return {"results": []}
+        if not include_values:
+            keys = takewhile(end_b.__ge__, cursor.iternext(values=False))
+            return {"results": [key.decode() for key in keys]}
+        for key, raw in cursor.iternext():
+            key = bytes(key)
+            if key > end_b:
                 break
-            if include_values:
-                data = json.loads(cursor.value())
-                results.append({"key": key, "value": data})
-            else:
-                results.append(key)
-            found = cursor.next()
+            results.append({"key": key.decode(), "value": _loads(raw)})
     return {"results": results}
 
 
 @server.tool()
-def backup_database(db_path: str, backup_path: str) -> dict:
+def backup_database(
+    db_path: str,
+    backup_path: str,
+    background: bool = False,
+) -> dict:
     """Backup the entire LMDB environment to a new location.
 
+    The copy is compacted: free pages are omitted and the backup is written
+    in a single pass under one read transaction.
+
     Args:
         db_path: Path to the source LMDB environment.
         backup_path: Destination directory for the backup.
+        background: Return immediately and copy on a worker thread; poll
+            ``backup_status`` with the same ``backup_path`` for the outcome.
 
     Returns:
-        Mapping with the path to the backup.
+        Mapping with the path to the backup, and "status" for background
+        copies.
     """
     os.makedirs(backup_path, exist_ok=True)
-    env = _open_env(db_path)
-    env.copy(backup_path)
+    if background:
+        # Take a writable handle up front where writes are possible, so a
+        # later write tool does not have to reopen it while the copy runs.
+        env = _acquire_env(db_path, readonly=not os.access(db_path, os.W_OK))
+        job = _backups.submit(env.copy, backup_path, compact=True)
+        _backup_jobs[backup_path] = job
+        job.add_done_callback(lambda done: _release_env(db_path))
+        job.add_done_callback(lambda done: _log_backup_failure(done, backup_path))
+        return {"backup_path": backup_path, "status": "running"}
+    _env(db_path).copy(backup_path, compact=True)
     return {"backup_path": backup_path}
 
 
+@server.tool()
+def backup_status(backup_path: str) -> dict:
+    """Report the outcome of a background backup.
+
+    Args:
+        backup_path: Destination passed to ``backup_database``.
+
+    Returns:
+        Mapping with "status" of "running", "done" or "failed", and "error"
+        for failed copies. A finished backup is reported once, then
+        forgotten.
+    """
+    job = _backup_jobs.get(backup_path)
+    if job is None:
+        return {"backup_path": backup_path, "status": None, "error": "no background backup"}
+    if not job.done():
+        return {"backup_path": backup_path, "status": "running"}
+    if _backup_jobs.get(backup_path) is job:
+        del _backup_jobs[backup_path]
+    error = job.exception()
+    if error is not None:
+        return {"backup_path": backup_path, "status": "failed", "error": str(error)}
+    return {"backup_path": backup_path, "status": "done"}
+
+
 @server.tool()
 def next_pending(
     db_path: str,
@@ -333,22 +780,19 @@ def next_pending(
     Returns:
         Mapping with "key" and "value" or None if not found.
     """
-    env = _open_env(db_path)
+    env = _env(db_path)
     with env.begin() as txn:
         cursor = txn.cursor()
         if after_key:
-            found = cursor.set_range(after_key.encode())
-            if found and cursor.key().decode() == after_key:
-                cursor.next()
+            after_b = _encode_key(after_key)
+            found = cursor.set_range(after_b)
+            if found and cursor.key() == after_b:
+                found = cursor.next()
         else:
-            cursor.first()
-        while cursor.key() is not None:
-            key = cursor.key().decode()
-            data = json.loads(cursor.value())
-            if data.get(column) == 1:
-                return {"key": key, "value": data}
-            if not cursor.next():
-                break
+            found = cursor.first()
+        if found:
+            for key, raw in _matching_rows(cursor.iternext(), column, 1):
+                return {"key": key.decode(), "value": _loads(raw)}
     return {"key": None, "value": None}
 
 
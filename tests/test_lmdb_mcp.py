@@ -70,6 +70,22 @@ def no_pending_db_path(tmp_path):
     return str(path)
 
 
+@pytest.fixture()
+def text_db_path(tmp_path):
+    path = tmp_path / "textdb"
+    env = lmdb.open(str(path), map_size=10485760)
+    with env.begin(write=True) as txn:
+        txn.put(b"a", json.dumps({"name": "caf\u00e9", "tag": None}).encode())
+        txn.put(
+            b"b",
+            json.dumps({"name": "caf\u00e9"}, ensure_ascii=False, separators=(",", ":")).encode(),
+        )
+        txn.put(b"c", json.dumps({"name": "cafe", "note": "caf\u00e9"}).encode())
+        txn.put(b"d", b'{"n\\u0061me": "caf\\u00E9", "path": "a\\/b"}')
+    env.close()
+    return str(path)
+
+
 # --- search tests ---
 
 def test_search_match_returns_results(db_path):
@@ -107,12 +123,39 @@ def test_search_invalid_page_zero(big_db_path):
     assert res["results"] == [] and res["next_page"] == 1
 
 
+def test_search_negative_page_counts_from_end(big_db_path):
+    res = srv.search.fn(big_db_path, field="status", value=1, page=-1)
+    keys = [r["key"] for r in res["results"]]
+    assert keys[0] == "task:13" and len(keys) == 10 and res["next_page"] == 0
+
+
+def test_search_raw_json_values(db_path):
+    res = srv.search.fn(db_path, field="status", value=2, raw_json=True)
+    assert res["results"] == [{"key": "task:5", "value": '{"id": 5, "status": 2}'}]
+
+
+def test_search_string_value_any_encoding(text_db_path):
+    res = srv.search.fn(text_db_path, field="name", value="caf\u00e9")
+    assert [r["key"] for r in res["results"]] == ["a", "b", "d"]
+    assert srv.count.fn(text_db_path, prefix="", column="path", value="a/b")["count"] == 1
+
+
+def test_search_null_value(text_db_path):
+    res = srv.search.fn(text_db_path, field="tag", value=None)
+    assert [r["key"] for r in res["results"]] == ["a", "b", "c", "d"]
+
+
 # --- get_row tests ---
 
 def test_get_row_existing(db_path):
     assert srv.get_row.fn(db_path, "task:2")["value"]["id"] == 2
 
 
+def test_get_row_raw_json(db_path):
+    res = srv.get_row.fn(db_path, "task:2", raw_json=True)
+    assert json.loads(res["value"]) == {"id": 2, "status": 1}
+
+
 def test_get_row_missing_returns_none(db_path):
     assert srv.get_row.fn(db_path, "missing")["value"] is None
 
@@ -169,6 +212,12 @@ def test_list_keys_third_page_huge_empty(huge_db_path):
     assert page["keys"] == []
 
 
+def test_list_keys_exact_page_boundary(db_path):
+    srv.bulk_insert.fn(db_path, {f"row:{i:03d}": {"id": i} for i in range(195)})
+    page = srv.list_keys.fn(db_path, page=1)
+    assert len(page["keys"]) == 200 and page["next_page"] is None
+
+
 def test_list_keys_zero_page(huge_db_path):
     page = srv.list_keys.fn(huge_db_path, page=0)
     assert page["keys"] == []
@@ -205,10 +254,122 @@ def test_count_prefix_empty(db_path):
     assert srv.count.fn(db_path, prefix="", column="status", value=1)["count"] == 3
 
 
+def test_count_prefix_range_only(db_path):
+    srv.bulk_insert.fn(db_path, {"a:1": {"status": 1}, "z:1": {"status": 1}})
+    assert srv.count.fn(db_path, prefix="task:", column="status", value=1)["count"] == 3
+
+
+def test_count_prefix_after_last_key(db_path):
+    assert srv.count.fn(db_path, prefix="zzz", column="status", value=1)["count"] == 0
+
+
 def test_count_value_type_mismatch(db_path):
     assert srv.count.fn(db_path, prefix="task:", column="status", value="1")["count"] == 0
 
 
+def test_count_ignores_nested_field(tmp_path):
+    path = tmp_path / "nested"
+    env = lmdb.open(str(path), map_size=10485760)
+    with env.begin(write=True) as txn:
+        txn.put(b"a", json.dumps({"meta": {"status": 1}}).encode())
+        txn.put(b"b", json.dumps({"meta": {"status": 1}, "status": 1}).encode())
+    env.close()
+    assert srv.count.fn(str(path), prefix="", column="status", value=1)["count"] == 1
+
+
+def test_count_prefix_only(db_path):
+    srv.bulk_insert.fn(db_path, {"a:1": {"status": 1}, "z:1": {"status": 1}})
+    assert srv.count.fn(db_path, prefix="task:")["count"] == 5
+
+
+def test_count_prefix_only_stops_at_range_end(db_path):
+    srv.bulk_insert.fn(db_path, {"task": {}, "task;": {}, "task:\uffff": {}})
+    assert srv.count.fn(db_path, prefix="task:")["count"] == 6
+
+
+def test_prefix_end():
+    assert srv._prefix_end(b"ab") == b"ac"
+    assert srv._prefix_end(b"a\xff\xff") == b"b"
+    assert srv._prefix_end(b"\xff") is None
+
+
+def test_count_prefix_only_empty_prefix(db_path):
+    assert srv.count.fn(db_path, prefix="")["count"] == 5
+
+
+def test_count_prefix_only_no_match(db_path):
+    assert srv.count.fn(db_path, prefix="foo:")["count"] == 0
+
+
+def test_count_reuses_result_until_next_write(db_path, monkeypatch):
+    assert srv.count.fn(db_path, prefix="task:", column="status", value=1)["count"] == 3
+    monkeypatch.setattr(srv, "_count_rows", lambda *args: pytest.fail("rescanned"))
+    assert srv.count.fn(db_path, prefix="task:", column="status", value=1)["count"] == 3
+    monkeypatch.undo()
+    srv.set_value.fn(db_path, "task:3", "status", 1)
+    assert srv.count.fn(db_path, prefix="task:", column="status", value=1)["count"] == 4
+
+
+def test_count_cache_keeps_value_types_apart(db_path):
+    assert srv.count.fn(db_path, prefix="task:", column="missing", value=None)["count"] == 5
+    assert srv.count.fn(db_path, prefix="task:", column="missing", value=float("nan"))["count"] == 0
+    srv.set_value.fn(db_path, "task:1", "meta", {"1": "a"})
+    assert srv.count.fn(db_path, prefix="task:", column="meta", value={"1": "a"})["count"] == 1
+    assert srv.count.fn(db_path, prefix="task:", column="meta", value={1: "a"})["count"] == 0
+
+
+def test_count_matches_equal_values_in_any_form(tmp_path):
+    path = tmp_path / "forms"
+    env = lmdb.open(str(path), map_size=10485760)
+    with env.begin(write=True) as txn:
+        txn.put(b"a", b'{"status":1.0}')
+        txn.put(b"b", b'{"status" :\n true}')
+        txn.put(b"c", b'{"id": 1, "status": 0}')
+        txn.put(b"d", b'{"note": "\\"status\\": 1", "status": 2}')
+    env.close()
+    assert srv.count.fn(str(path), prefix="", column="status", value=1)["count"] == 2
+
+
+def test_count_float_and_bool_values(tmp_path):
+    path = tmp_path / "numbers"
+    env = lmdb.open(str(path), map_size=10485760)
+    with env.begin(write=True) as txn:
+        txn.put(b"a", b'{"score": 2, "done": 1}')
+        txn.put(b"b", b'{"score": 2.0, "done": true}')
+        txn.put(b"c", b'{"score": 2.5, "done": false}')
+        txn.put(b"d", b'{"score": 2e0, "done": 1e0}')
+        txn.put(b"e", b'{"score": 1e2}')
+    env.close()
+    assert srv.count.fn(str(path), prefix="", column="score", value=2.0)["count"] == 3
+    assert srv.count.fn(str(path), prefix="", column="score", value=2)["count"] == 3
+    assert srv.count.fn(str(path), prefix="", column="score", value=100)["count"] == 1
+    assert srv.count.fn(str(path), prefix="", column="score", value=2.5)["count"] == 1
+    assert srv.count.fn(str(path), prefix="", column="done", value=True)["count"] == 3
+    assert srv.count.fn(str(path), prefix="", column="done", value=False)["count"] == 1
+
+
+def test_count_and_search_rows_with_nan(tmp_path):
+    path = tmp_path / "nan"
+    env = lmdb.open(str(path), map_size=10485760)
+    with env.begin(write=True) as txn:
+        txn.put(b"a", json.dumps({"x": float("nan"), "s": 1}).encode())
+        txn.put(b"b", json.dumps({"x": float("inf"), "s": 1}).encode())
+    env.close()
+    assert srv.count.fn(str(path), prefix="", column="s", value=1)["count"] == 2
+    assert srv.count.fn(str(path), prefix="", column="x", value=float("inf"))["count"] == 1
+    assert [r["key"] for r in srv.search.fn(str(path), "s", 1)["results"]] == ["a", "b"]
+
+
+def test_count_non_object_row_raises(tmp_path):
+    path = tmp_path / "array"
+    env = lmdb.open(str(path), map_size=10485760)
+    with env.begin(write=True) as txn:
+        txn.put(b"a", b'[{"status": 1}]')
+    env.close()
+    with pytest.raises(AttributeError):
+        srv.count.fn(str(path), prefix="", column="status", value=1)
+
+
 # --- set_value tests ---
 
 def test_set_value_updates_existing(db_path):
@@ -231,11 +392,51 @@ def test_set_value_adds_new_column(db_path):
     assert res["updated"] is True and srv.get_row.fn(db_path, "task:1")["value"]["extra"] == 5
 
 
+def test_set_value_patches_scalar_in_place(db_path):
+    srv.set_value.fn(db_path, "task:1", "status", "a \"quoted\" value")
+    env = srv._env(db_path)
+    with env.begin() as txn:
+        raw = txn.get(b"task:1")
+    assert raw == b'{"id": 1, "status": "a \\"quoted\\" value"}'
+    srv.set_value.fn(db_path, "task:1", "status", None)
+    assert srv.get_row.fn(db_path, "task:1")["value"] == {"id": 1, "status": None}
+
+
+def test_set_value_ignores_nested_field(db_path):
+    srv.create_record.fn(db_path, "nested", {"meta": {"status": 0}})
+    srv.set_value.fn(db_path, "nested", "status", 1)
+    value = srv.get_row.fn(db_path, "nested")["value"]
+    assert value == {"meta": {"status": 0}, "status": 1}
+
+
+def test_set_value_escaped_top_level_key(db_path):
+    env = srv._env(db_path, readonly=False)
+    with env.begin(write=True) as txn:
+        txn.put(b"esc", b'{"st\\u0061tus": 1, "x": {"status": 1}}')
+    assert srv.set_value.fn(db_path, "esc", "status", 5)["updated"] is True
+    assert srv.get_row.fn(db_path, "esc")["value"] == {"status": 5, "x": {"status": 1}}
+
+
+def test_set_value_replaces_nested_value(db_path):
+    srv.set_value.fn(db_path, "task:1", "status", {"state": 1})
+    srv.set_value.fn(db_path, "task:1", "status", 2)
+    assert srv.get_row.fn(db_path, "task:1")["value"]["status"] == 2
+
+
 def test_set_value_non_serializable_value(db_path):
     with pytest.raises(TypeError):
         srv.set_value.fn(db_path, "task:1", "status", object())
 
 
+def test_set_value_keeps_non_finite_floats(db_path):
+    srv.set_value.fn(db_path, "task:1", "status", float("-inf"))
+    assert srv._dumps(float("nan")) == b"NaN"
+    assert srv._dumps({"a": None, "b": "caf\u00e9"}) == '{"a":null,"b":"caf\u00e9"}'.encode()
+    assert srv._dumps({"a": [{"b": float("inf")}]}) == b'{"a":[{"b":Infinity}]}'
+    assert srv._dumps("\ud800") == b'"\\ud800"'
+    assert srv.get_row.fn(db_path, "task:1", raw_json=True)["value"] == '{"id": 1, "status": -Infinity}'
+
+
 def test_set_value_bytes_key_raises(db_path):
     with pytest.raises(AttributeError):
         srv.set_value.fn(db_path, b"task:1", "status", 1)  # type: ignore[arg-type]
@@ -253,8 +454,8 @@ def test_create_record_inserts_new(db_path):
 
 
 def test_create_record_existing_key(db_path):
-    res = srv.create_record.fn(db_path, "task:1", {"id": 1})
-    assert res["created"] is False
+    res = srv.create_record.fn(db_path, "task:1", {"id": 99})
+    assert res["created"] is False and srv.get_row.fn(db_path, "task:1")["value"]["id"] == 1
 
 
 def test_create_record_non_serializable(db_path):
@@ -262,6 +463,11 @@ def test_create_record_non_serializable(db_path):
         srv.create_record.fn(db_path, "task:10", {"obj": object()})
 
 
+def test_create_record_big_int(db_path):
+    assert srv.create_record.fn(db_path, "big", {"n": 2**70})["created"] is True
+    assert srv.get_row.fn(db_path, "big")["value"] == {"n": 2**70}
+
+
 def test_create_record_empty_key(db_path):
     with pytest.raises(lmdb.BadValsizeError):
         srv.create_record.fn(db_path, "", {})
@@ -279,6 +485,34 @@ def test_set_columns_updates_multiple(db_path):
     assert res["updated"] is True and row["status"] == 1 and row["extra"] == 5
 
 
+def test_set_columns_keeps_big_ints(db_path):
+    srv.set_value.fn(db_path, "task:1", "id", 12345678901234567890123)
+    srv.set_columns.fn(db_path, "task:1", {"status": {"state": 1}})
+    assert srv.get_row.fn(db_path, "task:1")["value"]["id"] == 12345678901234567890123
+
+
+def test_set_columns_patches_scalars_in_place(db_path):
+    srv.set_columns.fn(db_path, "task:1", {"status": "done", "id": 10})
+    env = srv._env(db_path)
+    with env.begin() as txn:
+        assert txn.get(b"task:1") == b'{"id": 10, "status": "done"}'
+
+
+def test_set_columns_escaped_top_level_key(db_path):
+    env = srv._env(db_path, readonly=False)
+    with env.begin(write=True) as txn:
+        txn.put(b"esc", b'{"st\\u0061tus": 1, "id": 1, "x": {"status": 1}}')
+    srv.set_columns.fn(db_path, "esc", {"id": 2, "status": 9})
+    value = srv.get_row.fn(db_path, "esc")["value"]
+    assert value == {"status": 9, "id": 2, "x": {"status": 1}}
+
+
+def test_set_columns_mixed_updates(db_path):
+    srv.set_columns.fn(db_path, "task:1", {"status": 0, "tags": ["a"]})
+    value = srv.get_row.fn(db_path, "task:1")["value"]
+    assert value == {"id": 1, "status": 0, "tags": ["a"]}
+
+
 def test_set_columns_missing_key(db_path):
     res = srv.set_columns.fn(db_path, "missing", {"status": 1})
     assert res["updated"] is False
@@ -336,6 +570,22 @@ def test_next_pending_skips_non_pending(db_path):
     assert res["key"] == "task:4"
 
 
+def test_next_pending_skips_similar_bytes(tmp_path):
+    path = tmp_path / "similar"
+    env = lmdb.open(str(path), map_size=10485760)
+    with env.begin(write=True) as txn:
+        txn.put(b"a", b'{"status": 10, "id": 1}')
+        txn.put(b"b", b'{"meta": {"status": 1}}')
+        txn.put(b"c", b'{"status":1}')
+    env.close()
+    assert srv.next_pending.fn(str(path), column="status")["key"] == "c"
+
+
+def test_next_pending_after_key_past_end(db_path):
+    res = srv.next_pending.fn(db_path, column="status", after_key="zzz")
+    assert res["key"] is None
+
+
 # --- delete_record tests ---
 
 
@@ -371,6 +621,16 @@ def test_bulk_insert_skips_existing(db_path):
     assert res["inserted"] == 1 and srv.get_row.fn(db_path, "task:11")["value"]["id"] == 11
 
 
+def test_bulk_insert_appends_after_last_key(db_path):
+    records = {f"zz:{i}": {"id": i} for i in range(3)}
+    res = srv.bulk_insert.fn(db_path, records)
+    assert res["inserted"] == 3 and srv.list_keys.fn(db_path)["keys"][-1] == "zz:2"
+
+
+def test_bulk_insert_empty(db_path):
+    assert srv.bulk_insert.fn(db_path, {})["inserted"] == 0
+
+
 def test_bulk_insert_non_serializable(db_path):
     with pytest.raises(TypeError):
         srv.bulk_insert.fn(db_path, {"task:12": {"obj": object()}})
@@ -395,6 +655,12 @@ def test_increment_field_non_numeric(db_path):
     assert res["updated"] is False
 
 
+def test_increment_field_float(db_path):
+    srv.set_value.fn(db_path, "task:1", "status", 1.5)
+    res = srv.increment_field.fn(db_path, "task:1", "status", amount=2)
+    assert res["value"] == 3.5 and srv.get_row.fn(db_path, "task:1")["value"]["status"] == 3.5
+
+
 def test_increment_field_missing_key(db_path):
     res = srv.increment_field.fn(db_path, "missing", "count")
     assert res["updated"] is False
@@ -428,6 +694,16 @@ def test_scan_range_start_after_end(db_path):
     assert res["results"] == []
 
 
+def test_scan_range_past_last_key(db_path):
+    res = srv.scan_range.fn(db_path, "u", "z", include_values=True)
+    assert res["results"] == []
+
+
+def test_scan_range_end_between_keys(db_path):
+    res = srv.scan_range.fn(db_path, "task:30", "task:4a")
+    assert res["results"] == ["task:4"]
+
+
 # --- backup_database tests ---
 
 
@@ -439,3 +715,91 @@ def test_backup_database_creates_copy(db_path, tmp_path):
     with env.begin() as txn:
         val = json.loads(txn.get(b"task:1"))
     assert val["id"] == 1
+
+
+# --- environment cache tests ---
+
+
+def test_env_is_reused_across_calls(db_path):
+    assert srv._env(db_path) is srv._env(db_path)
+
+
+def test_env_reopened_for_writes(db_path):
+    srv.get_row.fn(db_path, "task:1")
+    assert srv._env(db_path).flags()["readonly"] is True
+    srv.set_value.fn(db_path, "task:1", "status", 0)
+    assert srv._env(db_path).flags()["readonly"] is False
+    assert srv.get_row.fn(db_path, "task:1")["value"]["status"] == 0
+
+
+def test_env_eviction_closes_idle_handles(db_path, tmp_path, monkeypatch):
+    monkeypatch.setattr(srv, "_MAX_ENVS", 1)
+    other = str(tmp_path / "other")
+    lmdb.open(other, map_size=10485760).close()
+    first = srv._acquire_env(db_path)
+    srv._env(other)
+    assert srv._envs.get(db_path) is first
+    srv._release_env(db_path)
+    srv._env(other)
+    srv._env(tmp_path.joinpath("third").as_posix(), readonly=False)
+    assert db_path not in srv._envs and other not in srv._envs
+    with pytest.raises(lmdb.Error):
+        first.begin()
+    assert srv.get_row.fn(db_path, "task:1")["value"]["id"] == 1
+
+
+def test_env_held_read_only_handle_is_not_reopened(db_path):
+    env = srv._acquire_env(db_path)
+    with pytest.raises(lmdb.ReadonlyError):
+        srv.set_value.fn(db_path, "task:1", "status", 0)
+    assert srv._env(db_path) is env and env.stat()["entries"] == 5
+    srv._release_env(db_path)
+    assert srv.set_value.fn(db_path, "task:1", "status", 0)["updated"] is True
+
+
+def test_rewrite_row_retries_after_concurrent_write(db_path):
+    env = srv._env(db_path, readonly=False)
+    seen = []
+
+    def rewrite(raw):
+        seen.append(json.loads(raw)["status"])
+        if len(seen) == 1:
+            srv.set_value.fn(db_path, "task:1", "status", 7)
+        return b'{"status": 8}', {"updated": True}
+
+    assert srv._rewrite_row(env, b"task:1", rewrite) == {"updated": True}
+    assert seen == [1, 7] and srv.get_row.fn(db_path, "task:1")["value"] == {"status": 8}
+
+
+def test_rewrite_row_missing_key(db_path):
+    env = srv._env(db_path, readonly=False)
+    assert srv._rewrite_row(env, b"missing", lambda raw: (raw, {})) is None
+
+
+def test_close_env_forgets_handle(db_path):
+    env = srv._env(db_path)
+    srv._close_env(db_path)
+    assert srv._env(db_path) is not env
+
+
+def test_backup_database_background(db_path, tmp_path):
+    backup = tmp_path / "bgbackup"
+    res = srv.backup_database.fn(db_path, str(backup), background=True)
+    assert res["status"] == "running"
+    assert srv._env(db_path).flags()["readonly"] is False
+    srv._backups.submit(lambda: None).result()
+    assert srv.backup_status.fn(str(backup))["status"] == "done"
+    assert srv.backup_status.fn(str(backup))["status"] is None
+    env = lmdb.open(str(backup), max_dbs=1, map_size=10485760)
+    with env.begin() as txn:
+        assert txn.stat(env.open_db())["entries"] == 5
+
+
+def test_backup_status_reports_failure(db_path, tmp_path):
+    backup = tmp_path / "bgbackup"
+    srv.backup_database.fn(db_path, str(backup))
+    srv.backup_database.fn(db_path, str(backup), background=True)
+    srv._backups.submit(lambda: None).result()
+    res = srv.backup_status.fn(str(backup))
+    assert res["status"] == "failed" and res["error"]
+    assert srv.backup_status.fn(str(tmp_path / "none"))["status"] is None